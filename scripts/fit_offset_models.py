@@ -11,6 +11,7 @@ It supports:
 - Predicting new values using saved models
 - Optional plotting
 - Saving results (coefficients and R²) to a text file
+- Optionally caching the parsed TSV file on disk (--cache_dir)
 
 Usage examples:
 ---------------
@@ -29,61 +30,126 @@ python fit_offset_models.py ../templates/offsets_example.tsv --predict_el 40
 """
 
 import argparse
-import pandas as pd
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 from numpy.polynomial import Polynomial
-from sklearn.metrics import r2_score
-from scipy.stats import zscore
 import joblib
 
+# pandas, scikit-learn and matplotlib are slow to import, so they are imported
+# only in the functions that need them: the predict mode uses none of them
+
+NUMERIC_COLUMNS = ["azimuth", "elevation", "offset_az", "offset_el"]
+
+# Size limit of the optional disk cache of parsed TSV files (--cache_dir)
+CACHE_BYTES_LIMIT = "100M"
+
+
+def _polyfit_scaled(x, y, degree):
+    """Least-squares polynomial fit; return coefficients, lowest order first.
+
+    x must already be scaled to [-1, 1]: for degree <= 2 the fit solves the
+    normal equations, whose conditioning is the square of the Vandermonde one,
+    so on unscaled data (e.g. raw azimuths) it would lose precision.
+    """
+    if degree <= 2:
+        # Solving the (degree + 1)x(degree + 1) system is cheaper than an SVD
+        vander = np.polynomial.polynomial.polyvander(x, degree)
+        try:
+            return np.linalg.solve(vander.T @ vander, vander.T @ y)
+        except np.linalg.LinAlgError:
+            pass  # exactly singular Gram matrix; let lstsq handle it
+    return np.polynomial.polynomial.polyfit(x, y, degree)
+
 
 def fit_with_zscore(x, y, degree=3, z=3.0):
     """Perform polynomial fit with outlier removal based on z-score."""
-    # Ensure inputs are float arrays
-    x = np.asarray(x, dtype=float)
-    y = np.asarray(y, dtype=float)
+    from sklearn.metrics import r2_score
+
+    # Ensure inputs are float arrays (no copy for float64 ndarrays)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
 
     # Compute z-scores; handle the case where std is zero or NaN
+    y_mean = y.mean()
     y_std = y.std()
     if y_std == 0 or np.isnan(y_std):
         mask = np.ones_like(y, dtype=bool)  # keep all points
     else:
-        zscores = np.abs((y - y.mean()) / y_std)
-        mask = zscores < z  # keep points within threshold
+        # |y - mean| / std < z, computed in place in a single buffer
+        tmp = np.empty_like(y)
+        np.subtract(y, y_mean, out=tmp)
+        np.abs(tmp, out=tmp)
+        mask = tmp < z * y_std  # keep points within threshold
 
     # Filter out outliers
     x_clean = x[mask]
     y_clean = y[mask]
 
-    # Fit a polynomial model to the filtered data
-    p_clean = Polynomial.fit(x_clean, y_clean, deg=degree).convert()
-    y_pred = p_clean(x_clean)
+    # Fit in the well conditioned variable xs = (x - x_mid) / x_scale in [-1, 1]
+    x_mid = (x_clean.min() + x_clean.max()) / 2
+    x_scale = (x_clean.max() - x_clean.min()) / 2 or 1.0
+    xs = (x_clean - x_mid) / x_scale
+    coeffs = _polyfit_scaled(xs, y_clean, degree)
+    y_pred = np.polynomial.polynomial.polyval(xs, coeffs)
+
+    # Substitute xs back to get the model as a polynomial in x
+    p_clean = Polynomial(coeffs)(Polynomial([-x_mid / x_scale, 1 / x_scale]))
 
     # Compute R² score of the fitted model
     r2 = r2_score(y_clean, y_pred)
     return p_clean, x_clean, y_clean, r2
 
 
-def load_data(filepath):
+def load_data(filepath, cache_dir=None):
     """Load TSV file ignoring commented metadata lines.
     Force numeric types for required columns.
+    If cache_dir is given, the parsed data is cached on disk in that directory.
     """
+    if cache_dir is None:
+        return _parse_tsv(filepath)
+
+    import pandas as pd
+
+    # Key the cache on the file stats, so that an edited file is parsed again,
+    # and on the pandas version, which determines the parsing result
+    stat = os.stat(filepath)
+    cache_key = (stat.st_mtime_ns, stat.st_size, pd.__version__)
+    try:
+        memory = joblib.Memory(cache_dir, verbose=0)
+        df = memory.cache(_parse_tsv)(os.path.abspath(filepath), cache_key)
+        memory.reduce_size(bytes_limit=CACHE_BYTES_LIMIT)
+    except OSError:
+        # The cache directory is not usable: just parse the file
+        df = _parse_tsv(filepath)
+    return df
+
+
+def _parse_tsv(filepath, cache_key=None):
+    """Parse the TSV file. cache_key only identifies the file version in the
+    disk cache used by load_data().
+    """
+    import pandas as pd
+
     df = pd.read_csv(filepath, sep="\t", comment="#")
-    # Force numeric types; convert non-numeric values to NaN
-    for col in ["azimuth", "elevation", "offset_az", "offset_el"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Force numeric float64 types in a single pass over the four columns;
+    # convert non-numeric values (e.g. malformed rows) to NaN
+    df[NUMERIC_COLUMNS] = (
+        df[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    )
     # Drop rows with missing essential values for fitting
-    df = df.dropna(subset=["azimuth", "elevation", "offset_az", "offset_el"])
+    df.dropna(subset=NUMERIC_COLUMNS, inplace=True)
     return df
 
 
 def plot_fit(x_raw, y_raw, x_clean, y_clean, model, xlabel, ylabel, title):
     """Plot model vs data."""
+    import matplotlib.pyplot as plt
+
     x_plot = np.linspace(min(x_clean), max(x_clean), 200)
     plt.scatter(x_raw, y_raw, color="gray", label="Raw data")
     plt.scatter(x_clean, y_clean, color="blue", label="Filtered data")
-    plt.plot(x_plot, model(x_plot), color="red", label="Fit")
+    y_plot = np.polynomial.polynomial.polyval(x_plot, model.coef)
+    plt.plot(x_plot, y_plot, color="red", label="Fit")
     plt.xlabel(xlabel)
     plt.ylabel(ylabel)
     plt.title(title)
@@ -92,22 +158,40 @@ def plot_fit(x_raw, y_raw, x_clean, y_clean, model, xlabel, ylabel, title):
 
 
 def save_model(model, filename):
-    joblib.dump(model, filename)
+    # Only the power-basis coefficients are needed to evaluate the model
+    joblib.dump(model.coef.astype(np.float64), filename)
+
 
+def format_model(coef):
+    """Format polynomial coefficients (lowest order first) as a string.
+    Coefficients are written with all the digits needed to read them back.
+    """
+    powers = ["", "*x"] + [f"*x^{i}" for i in range(2, len(coef))]
+    terms = [repr(float(coef[0]))] + [
+        f" {'-' if c < 0 else '+'} {abs(float(c))!r}{p}"
+        for c, p in zip(coef[1:], powers[1:])
+    ]
+    return "y = " + "".join(terms)
 
-def save_summary(filename, model_az, r2_az, model_el, r2_el):
+
+def save_summary(filename, coef_az, r2_az, coef_el, r2_el):
     """Save model summary to text file."""
     with open(filename, "w") as f:
         f.write("Model: offset_az = f(azimuth)\n")
-        f.write(str(model_az) + "\n")
+        f.write(format_model(coef_az) + "\n")
         f.write(f"R² = {r2_az:.4f}\n\n")
         f.write("Model: offset_el = f(elevation)\n")
-        f.write(str(model_el) + "\n")
+        f.write(format_model(coef_el) + "\n")
         f.write(f"R² = {r2_el:.4f}\n")
 
 
 def load_model(filename):
-    return joblib.load(filename)
+    """Load model coefficients, lowest order first.
+    Model files from older versions hold a Polynomial (already converted to
+    the power basis): return its coefficients.
+    """
+    model = joblib.load(filename)
+    return np.asarray(getattr(model, "coef", model), dtype=np.float64)
 
 
 def main():
@@ -123,6 +207,10 @@ def main():
     parser.add_argument(
         "--output", default="fit_results.txt", help="Output text file for summary"
     )
+    parser.add_argument(
+        "--cache_dir",
+        help="Cache the parsed TSV file in this directory (default: no cache)",
+    )
     parser.add_argument(
         "--predict_az", type=float, help="Predict offset_az for a given azimuth"
     )
@@ -134,41 +222,49 @@ def main():
     # Prediction mode
     if args.predict_az or args.predict_el:
         if args.predict_az:
-            model = load_model("model_offset_az.joblib")
-            print(f"Predicted offset_az: {model(args.predict_az):.4f} arcsec")
+            coef = load_model("model_offset_az.joblib")
+            offset = np.polynomial.polynomial.polyval(args.predict_az, coef)
+            print(f"Predicted offset_az: {offset:.4f} arcsec")
         if args.predict_el:
-            model = load_model("model_offset_el.joblib")
-            print(f"Predicted offset_el: {model(args.predict_el):.4f} arcsec")
+            coef = load_model("model_offset_el.joblib")
+            offset = np.polynomial.polynomial.polyval(args.predict_el, coef)
+            print(f"Predicted offset_el: {offset:.4f} arcsec")
         return
 
     # Fit mode
-    df = load_data(args.tsv_file)
+    df = load_data(args.tsv_file, cache_dir=args.cache_dir)
+    azimuth = df["azimuth"].to_numpy(dtype=np.float64, copy=False)
+    offset_az = df["offset_az"].to_numpy(dtype=np.float64, copy=False)
+    elevation = df["elevation"].to_numpy(dtype=np.float64, copy=False)
+    offset_el = df["offset_el"].to_numpy(dtype=np.float64, copy=False)
 
     model_az, x_az, y_az, r2_az = fit_with_zscore(
-        df["azimuth"], df["offset_az"], degree=args.degree
+        azimuth, offset_az, degree=args.degree
     )
     print("\nModel: offset_az = f(azimuth)")
-    print(model_az)
+    print(format_model(model_az.coef))
     print(f"R² = {r2_az:.4f}")
     save_model(model_az, "model_offset_az.joblib")
 
     model_el, x_el, y_el, r2_el = fit_with_zscore(
-        df["elevation"], df["offset_el"], degree=args.degree
+        elevation, offset_el, degree=args.degree
     )
     print("\nModel: offset_el = f(elevation)")
-    print(model_el)
+    print(format_model(model_el.coef))
     print(f"R² = {r2_el:.4f}")
     save_model(model_el, "model_offset_el.joblib")
 
-    save_summary(args.output, model_az, r2_az, model_el, r2_el)
+    save_summary(args.output, model_az.coef, r2_az, model_el.coef, r2_el)
     print(f"\nSummary saved to: {args.output}")
 
     if args.plot:
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(12, 5))
         plt.subplot(1, 2, 1)
         plot_fit(
-            df["azimuth"],
-            df["offset_az"],
+            azimuth,
+            offset_az,
             x_az,
             y_az,
             model_az,
@@ -178,8 +274,8 @@ def main():
         )
         plt.subplot(1, 2, 2)
         plot_fit(
-            df["elevation"],
-            df["offset_el"],
+            elevation,
+            offset_el,
             x_el,
             y_el,
             model_el,
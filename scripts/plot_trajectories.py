@@ -33,6 +33,7 @@ Example usage:
 
 import argparse
 import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter
 import numpy as np
 from astropy.time import Time
 from astropy.coordinates import EarthLocation, NonRotationTransformationWarning
@@ -150,7 +151,7 @@ def plot_trajectories(ideal_altaz, real_altaz, mode="both", params=None):
     times = ideal_altaz.obstime
     t0 = times[0]
     seconds = (times - t0).sec
-    timestamps = [t.datetime.strftime("%H:%M:%S") for t in times]
+    timestamps = times.strftime("%H:%M:%S")
     fig, ax1 = plt.subplots(figsize=(10, 6))
 
     if mode == "azimuth":
@@ -190,7 +191,7 @@ def plot_trajectories(ideal_altaz, real_altaz, mode="both", params=None):
     ax2.set_xlim(ax1.get_xlim())
     tick_locs = np.linspace(seconds[0], seconds[-1], min(8, len(seconds)))
     ax2.set_xticks(tick_locs)
-    ax2.set_xticklabels([tick_format(x, None) for x in tick_locs])
+    ax2.xaxis.set_major_formatter(FuncFormatter(tick_format))
     ax2.set_xlabel("Time [UTC]")
     fig.tight_layout()
 
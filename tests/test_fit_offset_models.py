@@ -0,0 +1,61 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def fit_offset_models():
+    script_path = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "scripts", "fit_offset_models.py")
+    )
+    spec = importlib.util.spec_from_file_location("fit_offset_models", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("degree", [0, 1, 2, 3])
+def test_polyfit_scaled_matches_numpy_polyfit(fit_offset_models, degree):
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(-1, 1, 50))
+    y = 300 - 20 * x + 5 * x**2 - 3 * x**3 + rng.normal(0, 1, x.size)
+    coef = fit_offset_models._polyfit_scaled(x, y, degree)
+    expected = np.polynomial.polynomial.polyfit(x, y, degree)
+    assert coef.shape == (degree + 1,)
+    assert np.allclose(coef, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_polyfit_scaled_singular_falls_back_to_lstsq(fit_offset_models):
+    x = np.array([0.5, 0.5, 0.5])
+    y = np.array([1.0, 2.0, 3.0])
+    # polyfit (lstsq) warns about the rank deficiency
+    with pytest.warns(np.exceptions.RankWarning):
+        coef = fit_offset_models._polyfit_scaled(x, y, 1)
+    assert np.isclose(np.polynomial.polynomial.polyval(0.5, coef), 2.0)
+
+
+def test_format_model_degree_0(fit_offset_models):
+    assert fit_offset_models.format_model(np.array([-2.5])) == "y = -2.5"
+
+
+def test_format_model_degree_1(fit_offset_models):
+    coef = np.array([284.05523862, -0.07143088])
+    assert fit_offset_models.format_model(coef) == "y = 284.05523862 - 0.07143088*x"
+
+
+def test_format_model_higher_degree_terms(fit_offset_models):
+    coef = np.array([1.0, 0.5, -42.1589827, 3.0e-5])
+    assert (
+        fit_offset_models.format_model(coef)
+        == "y = 1.0 + 0.5*x - 42.1589827*x^2 + 3e-05*x^3"
+    )
+
+
+def test_format_model_round_trips_coefficients(fit_offset_models):
+    coef = np.array([313.91912345678901, -0.8439187654321, 0.002125091234567])
+    text = fit_offset_models.format_model(coef)
+    terms = text.removeprefix("y = ").replace(" - ", " + -").split(" + ")
+    parsed = [float(term.split("*")[0]) for term in terms]
+    assert parsed == coef.tolist()